@@ -0,0 +1,180 @@
+import http.cookiejar
+import requests
+import time
+
+from concurrent.futures import Future
+from functools import partial
+from threading import Lock
+
+from ptlibs.http.http_client import HttpClient
+from ptlibs.ptmisclib import get_response_data_dump
+from requests.adapters import HTTPAdapter
+
+
+class PooledHttpClient(HttpClient):
+    """
+    An HttpClient that sends requests through a single pooled requests.Session.
+
+    The ptlibs HttpClient opens a new connection (and TLS session) for every request. PTELASTIC sends all of
+    its probes to the same host, so keeping the connections alive and reusing them saves the TCP and TLS
+    handshakes on every request after the first one.
+
+    Responses to GET requests without a body are kept for the lifetime of the client, so modules probing the same
+    endpoint (e.g. /_security/user in both the auth and users tests) share a single request and its decoded JSON.
+
+    The class keeps the HttpClient.send_request interface, so it can be passed to the modules in place of the original
+    client. Unlike a plain requests.Session, it does not keep cookies set by the target between requests.
+    """
+
+    def __init__(self, args=None, ptjsonlib=None):
+        """
+        Initialize the client and mount a pooled HTTPAdapter for both HTTP and HTTPS.
+
+        Args:
+            args: Parsed command line arguments.
+            ptjsonlib: Shared PtJsonLib object.
+        """
+        # HttpClient is a singleton, __init__ runs only once
+        if hasattr(self, "_initialized"):
+            return
+
+        super().__init__(args=args, ptjsonlib=ptjsonlib)
+
+        # Up to -t/--threads modules run at once and each of them may send up to -t/--threads concurrent requests
+        # (Helpers.send_concurrent_requests), keep a reusable connection for every one of them
+        pool_maxsize = max(10, self.args.threads ** 2)
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=pool_maxsize)
+        self._session = requests.Session()
+        # The session must not replay cookies set by the target, every probe sends only the cookies it was given
+        self._session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+        self._shared_responses = {}
+        self._shared_lock = Lock()
+
+    def send_request(self, url, method="GET", *, headers=None, data=None, params=None, proxies=None, max_retries: int = 2, allow_redirects=True, cookies: dict | None = None, timeout=None, verify=False, cache=None, dump=False, store_urls=False, merge_headers=True, test_fpd=False, verbose=True, share_response=True, **kwargs):
+        """
+        Send an HTTP request over a pooled keep-alive connection.
+
+        GET requests without a body, query parameters, cookies, proxies or extra keyword arguments are shared, unless
+        ``share_response=False``: a repeated request returns the response received by the first one. If the same request
+        is already in flight in another thread, the call waits for its response instead of sending a duplicate.
+
+        Requests using the ptlibs on-disk cache (``cache=True`` or ``args.cache``) are sent by HttpClient.send_request.
+
+        Args:
+            url (str): Target URL.
+            method (str, optional): HTTP method to use. Defaults to "GET".
+            headers (dict, optional): Request-specific headers, merged with the base headers if ``merge_headers=True``.
+            data (Any, optional): Request body.
+            params (dict, optional): Query string parameters.
+            proxies (dict, optional): Proxies for this request. Defaults to the client's proxy.
+            max_retries (int, optional): How many times a failed request is retried. Defaults to 2.
+            allow_redirects (bool, optional): Whether to follow redirects. Defaults to True.
+            cookies (dict, optional): Cookies to attach to the request.
+            timeout (float or tuple, optional): Timeout in seconds. Defaults to the client's timeout.
+            verify (bool or str, optional): Whether to verify SSL certificates. Defaults to False.
+            cache (bool, optional): If True, the response is cached on disk by HttpClient. Defaults to ``args.cache``.
+            dump (bool, optional): If True, returns a tuple of the response and its request/response dump.
+            store_urls (bool, optional): If True, stores successfully requested URLs (non-404).
+            merge_headers (bool, optional): If True, merges base headers with provided ``headers``.
+            test_fpd (bool, optional): If True, runs the FPD vulnerability test for the response of a GET request.
+            verbose (bool, optional): Passed to the FPD test.
+            share_response (bool, optional): If False, the response is neither taken from nor kept for other callers.
+                Use it for large responses that are read only once. Defaults to True.
+            **kwargs: Additional keyword arguments passed directly to ``requests.Session.request()``.
+
+        Returns:
+            requests.Response: Response object from the executed HTTP request.
+        """
+        if cache is None:
+            cache = getattr(self.args, "cache", None)
+
+        if cache:
+            return super().send_request(url, method, headers=headers, data=data, params=params, proxies=proxies,
+                                        max_retries=max_retries, allow_redirects=allow_redirects, cookies=cookies,
+                                        timeout=timeout, verify=verify, cache=cache, dump=dump, store_urls=store_urls,
+                                        merge_headers=merge_headers, test_fpd=test_fpd, verbose=verbose, **kwargs)
+
+        # apply delay
+        if getattr(self.args, "delay", 0) > 0:
+            time.sleep(self.args.delay / 1000)
+
+        headers = self._merge_headers(headers, merge_headers)
+        send = partial(self._send, method, url, headers, data, allow_redirects, timeout, verify,
+                       max_retries=max_retries, params=params, proxies=proxies, cookies=cookies, **kwargs)
+
+        if method.upper() != "GET" or not share_response or any(arg is not None for arg in (data, params, proxies, cookies)) or kwargs:
+            response = send()
+        else:
+            response = self._send_shared((url, allow_redirects, timeout, verify, frozenset(headers.items())), send)
+
+        if (self.test_fpd or test_fpd) and method.upper() == "GET":
+            with self._lock:
+                self._check_fpd_in_response(response, verbose)
+
+        if (self._store_urls or store_urls) and response.status_code != 404:
+            with self._lock:
+                self._stored_urls.add(response.url)
+
+        return (response, get_response_data_dump(response)) if dump else response
+
+    def _send_shared(self, key, send):
+        """
+        Return the response shared under the key, or send the request and share its response.
+
+        Args:
+            key (tuple): Key identifying the request.
+            send (Callable): Sends the request and returns its response.
+
+        Returns:
+            requests.Response: Shared or freshly received response.
+        """
+        with self._shared_lock:
+            future = self._shared_responses.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = self._shared_responses[key] = Future()
+
+        if is_owner:
+            try:
+                future.set_result(send())
+            except BaseException as e:
+                # Failed requests are not shared, the next caller tries again. The future is resolved even on
+                # KeyboardInterrupt, otherwise the threads waiting for it would block forever
+                with self._shared_lock:
+                    del self._shared_responses[key]
+                future.set_exception(e)
+                raise
+
+        return future.result()
+
+    def _send(self, method, url, headers, data, allow_redirects, timeout, verify, *, max_retries=2, proxies=None, **kwargs):
+        """
+        Send the request through the pooled session, retrying it like HttpClient does, and remap requests exceptions
+        the same way HttpClient does.
+
+        Returns:
+            requests.Response: Response object from the executed HTTP request.
+        """
+        try:
+            for attempt in range(max_retries + 1):
+                try:
+                    return self._session.request(
+                        method,
+                        url,
+                        headers=headers,
+                        data=data,
+                        proxies=proxies or self.proxy or {},
+                        timeout=timeout or self.timeout,
+                        verify=verify,
+                        allow_redirects=allow_redirects,
+                        **kwargs
+                    )
+                except requests.exceptions.RequestException:
+                    if attempt == max_retries:
+                        raise
+                    time.sleep(1)
+        except Exception as e:
+            self._remap_requests_exception(e)
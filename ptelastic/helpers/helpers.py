@@ -4,22 +4,28 @@ Helpers module for shared functionality used across test modules.
 
 import json
 import os
+import orjson
+
+from concurrent.futures import Future, ThreadPoolExecutor
 
 from ptlibs.http.http_client import HttpClient
 from ptlibs.ptprinthelper import ptprint
 from requests import Response
 from http import HTTPStatus
 
+_OK = HTTPStatus.OK.value
+
 
 class Helpers:
     def __init__(self, args: object, ptjsonlib: object, http_client: object):
         """Helpers provides utility methods"""
         self.args = args
+        self._print_enabled = not args.json
         self.ptjsonlib = ptjsonlib
         self.http_client = http_client
 
     def print_header(self, test_label):
-        ptprint(f"Testing: {test_label}", "TITLE", not self.args.json, colortext=True)
+        ptprint(f"Testing: {test_label}", "TITLE", self._print_enabled, colortext=True)
 
     def check_node(self, node_type: str) -> str:
         """
@@ -35,17 +41,99 @@ class Helpers:
         return ""
 
 
+    def get_json(self, response: Response):
+        """
+        This method decodes the JSON body of a response and caches the result on the response object, so a response
+        shared by several modules (like the base response) is decoded only once
+
+        The raw body bytes are decoded with orjson, which is considerably faster than the standard json module on large
+        responses and skips decoding the body into a str first
+
+        :return: Decoded JSON body
+        :raises ValueError: If the response body is not valid JSON (orjson.JSONDecodeError is a ValueError)
+        """
+        if not hasattr(response, "_json_cache"):
+            response._json_cache = orjson.loads(response.content)
+
+        return response._json_cache
+
+
     def check_json(self, response: Response) -> bool:
         try:
-            response.json()
+            self.get_json(response)
         except ValueError as e:
-            ptprint(f"Could not get JSON from response: {e}", "OK", not self.args.json, indent=4)
+            ptprint(f"Could not get JSON from response: {e}", "OK", self._print_enabled, indent=4)
             ptprint(f"Got response: {response.text}", "ADDITIONS", self.args.verbose, indent=4, colortext=True)
             return False
 
         return True
 
 
+    def send_request(self, request: "Helpers.KbnUrlParser", allow_redirects: bool = False, share_response: bool = True):
+        """
+        This method sends a request built by KbnUrlParser with the user provided headers. By default redirects are not
+        followed, which is how the tests probe Elasticsearch endpoints
+
+        :param bool allow_redirects: Follow redirects
+        :param bool share_response: Share the response with other modules sending the same request (PooledHttpClient).
+                                    Set it to False for large responses that are read only once
+        :return: Response to the request
+        """
+        return self.http_client.send_request(request.url, method=request.method, headers=self.args.headers,
+                                             allow_redirects=allow_redirects, share_response=share_response)
+
+
+    def send_concurrent_requests(self, *requests: "Helpers.KbnUrlParser", allow_redirects: bool = False, share_response: bool = True) -> list:
+        """
+        This method sends independent requests at the same time, so their round trips overlap instead of adding up.
+
+        Only the HTTP requests run in worker threads. Responses are returned to the calling thread, so all printing
+        stays in the module's own output buffer. At most -t/--threads requests are in flight at once.
+
+        :param bool allow_redirects: Passed to send_request() for every request
+        :param bool share_response: Passed to send_request() for every request
+        :return: List of responses in the same order as the provided requests
+        """
+        if not requests:
+            return []
+
+        with ThreadPoolExecutor(max_workers=min(len(requests), self.args.threads)) as executor:
+            futures = [executor.submit(self.send_request, request, allow_redirects, share_response) for request in requests]
+
+        return [future.result() for future in futures]
+
+
+    def send_speculative_request(self, request: "Helpers.KbnUrlParser") -> Future:
+        """
+        This method sends a request in the background while the caller sends the requests it needs first. Only the HTTP
+        request runs in the worker thread
+
+        Errors of the request are raised by result() of the returned future, so they only surface if the caller decides to use
+        the response
+
+        :return: Future of the response
+        """
+        executor = ThreadPoolExecutor(max_workers=1)
+        future = executor.submit(self.send_request, request)
+        executor.shutdown(wait=False)
+
+        return future
+
+
+    def send_batched_requests(self, *requests: "Helpers.KbnUrlParser", allow_redirects: bool = False, share_response: bool = True):
+        """
+        This method sends independent requests concurrently in batches of -t/--threads requests. The next batch is sent only
+        after the responses of the previous one were consumed, so at most one batch of responses is held in memory
+
+        :param bool allow_redirects: Passed to send_request() for every request
+        :param bool share_response: Passed to send_request() for every request
+        :return: Generator of responses in the same order as the provided requests
+        """
+        for start in range(0, len(requests), self.args.threads):
+            yield from self.send_concurrent_requests(*requests[start:start + self.args.threads],
+                                                     allow_redirects=allow_redirects, share_response=share_response)
+
+
     class KbnUrlParser:
         """This class parses a URL if a PTELASTIC module was ran through the Kibana proxy"""
         def __init__(self, url: str, endpoint: str, method: str, kbn: bool):
@@ -58,29 +146,33 @@ class Helpers:
 
     def get_indices(self, http_client: object, url: str, kbn: bool, headers: object):
         """
-        This method retrieves all available indices at an ES instance
+        This method retrieves all available indices at an ES instance. The /_cat/indices endpoint is requested as JSON
+        so that index names are never mistaken for other values. Every row carries the index name in its "index" field
 
         :return: List of indices if successful. Empty list otherwise
         """
-        request = self.KbnUrlParser(url, "_cat/indices?pretty", "GET", kbn)
+        request = self.KbnUrlParser(url, "_cat/indices?format=json", "GET", kbn)
         response = http_client.send_request(method=request.method, url=request.url, headers=headers)
 
         try:
-            json_status = response.json().get("status", 200)
-        except ValueError:
-            json_status = 200
+            rows = self.get_json(response)
+        except ValueError as e:
+            ptprint(f"Error when reading indices: {e}", "ERROR", self._print_enabled, indent=4)
+            return []
+
+        json_status = rows.get("status", 200) if isinstance(rows, dict) else 200
 
-        if response.status_code != HTTPStatus.OK or json_status != HTTPStatus.OK:
+        if response.status_code != _OK or json_status != _OK:
             ptprint(
-                f"Error fetching indices. Received response: {response.status_code} {json.dumps(response.json(), indent=4)}",
+                f"Error fetching indices. Received response: {response.status_code} {json.dumps(rows, indent=4)}",
                 "ERROR",
-                not self.args.json, indent=4)
+                self._print_enabled, indent=4)
             return []
 
         try:
-            indices = [line.split()[2] for line in response.text.strip().split("\n") if line.strip()]
-        except Exception as e:
-            ptprint(f"Error when reading indices: {e}", "ERROR", not self.args.json, indent=4)
+            indices = [row["index"] for row in rows]
+        except (KeyError, TypeError) as e:
+            ptprint(f"Error when reading indices: {e}", "ERROR", self._print_enabled, indent=4)
             return []
 
-        return indices
\ No newline at end of file
+        return indices
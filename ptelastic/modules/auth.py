@@ -8,13 +8,14 @@ Contains:
 - run() function as an entry point for running the test
 """
 
-import http
 from ptlibs import ptjsonlib
 from ptlibs.ptprinthelper import ptprint
 from http import HTTPStatus
 
 __TESTLABEL__ = "Elasticsearch authentication test"
 
+_OK, _UNAUTHORIZED = HTTPStatus.OK.value, HTTPStatus.UNAUTHORIZED.value
+
 
 class Auth:
     """
@@ -24,6 +25,7 @@ class Auth:
 
     def __init__(self, args: object, ptjsonlib: object, helpers: object, http_client: object, base_response: object, kbn: bool) -> None:
         self.args = args
+        self._print_enabled = not args.json
         self.ptjsonlib = ptjsonlib
         self.helpers = helpers
         self.http_client = http_client
@@ -33,62 +35,64 @@ class Auth:
 
 
 
-    def _print_anon_role(self):
+    def _print_anon_role(self, request: object, response: object):
         """
-        This method prints the role of the anonymous user (if any)
+        This method prints the role of the anonymous user (if any) from the response of the /_security/user endpoint
         """
-        request = self.helpers.KbnUrlParser(self.args.url, "_security/user", "GET", self.kbn)
-        response = self.http_client.send_request(request.url , method=request.method, headers=self.args.headers, allow_redirects=False)
-
-        if not self.helpers.check_json:
+        if not self.helpers.check_json(response):
             return
 
-        json_status = response.json().get("status", 200)
+        users = self.helpers.get_json(response)
+        json_status = users.get("status", 200)
 
-        if response.status_code != http.HTTPStatus.OK or json_status != HTTPStatus.OK:
+        if response.status_code != _OK or json_status != _OK:
             ptprint(f"Error when probing authentication at {request.url}. Received response: {response.text}", "ERROR",
-                    not self.args.json, indent=4)
+                    self._print_enabled, indent=4)
             return
 
-        users = response.json()
-
-        for user in users.keys():
-            if "anon" in user or "anonymous" in user:
-                ptprint(f"Authentication is enabled, but anonymous access is allowed", "VULN", not self.args.json,
-                        indent=4)
-                ptprint(f"Anonymous role: {', '.join(users[user]['roles'])}", "VULN", not self.args.json, indent=8)
-                return
+        # 'anonymous' contains 'anon', so a single substring test covers both names
+        anon_user = next((user for user in users if "anon" in user), None)
 
-        ptprint(f"Authentication is enabled. Anonymous access is not available", "OK", not self.args.json, indent=4)
-        ptprint(f"Could not find username which would match 'anonymous' or 'anon'. All users: {','.join(users.keys())}",
-                "OK", not self.args.json, indent=4)
+        if anon_user:
+            ptprint(f"Authentication is enabled, but anonymous access is allowed", "VULN", self._print_enabled,
+                    indent=4)
+            ptprint(f"Anonymous role: {', '.join(users[anon_user]['roles'])}", "VULN", self._print_enabled, indent=8)
+        else:
+            ptprint(f"Authentication is enabled. Anonymous access is not available", "OK", self._print_enabled, indent=4)
+            ptprint(f"Could not find username which would match 'anonymous' or 'anon'. All users: {','.join(users)}",
+                    "OK", self._print_enabled, indent=4)
 
     def _test_anon_auth(self) -> None:
         """
         This method checks to see if authentication is truly disabled or anonymous access is allowed
+
+        The /_security/user endpoint is only needed when security is enabled, but it is requested in the background while
+        /_xpack is probed, so the two round trips overlap. Its response, or its error, is discarded if security turns out
+        to be disabled
         """
         request = self.helpers.KbnUrlParser(self.args.url, "_xpack?filter_path=features.security", "GET", self.kbn)
-        response = self.http_client.send_request(request.url , method=request.method, headers=self.args.headers, allow_redirects=False)
+        users_request = self.helpers.KbnUrlParser(self.args.url, "_security/user", "GET", self.kbn)
+        users_future = self.helpers.send_speculative_request(users_request)
+        response = self.helpers.send_request(request)
 
         if not self.helpers.check_json(response):
             return
 
-        json_status = response.json().get("status", 200)
+        security = self.helpers.get_json(response)
+        json_status = security.get("status", 200)
 
-        if response.status_code != http.HTTPStatus.OK or json_status != HTTPStatus.OK:
+        if response.status_code != _OK or json_status != _OK:
             ptprint(f"Error when probing authentication at {request.url}. Received response: {response.status_code}",
-                    "ERROR", not self.args.json, indent=4)
+                    "ERROR", self._print_enabled, indent=4)
             return
 
-        security = response.json()
-
         if not security.get("features", {}).get("security", {}).get("enabled", {}):
-            ptprint(f"Authentication is disabled", "VULN", not self.args.json, indent=4)
+            ptprint(f"Authentication is disabled", "VULN", self._print_enabled, indent=4)
             self.ptjsonlib.add_vulnerability("PTV-WEB-ELASTIC-AUTH")
             self.ptjsonlib.add_properties({"authentication": "disabled"})
             return
 
-        self._print_anon_role()
+        self._print_anon_role(users_request, users_future.result())
 
     def run(self) -> None:
         """
@@ -104,14 +108,14 @@ class Auth:
         """
         response = self.base_response
 
-        if response.status_code == http.HTTPStatus.UNAUTHORIZED:
-            ptprint(f"Authentication is enabled", "OK", not self.args.json, indent=4)
+        if response.status_code == _UNAUTHORIZED:
+            ptprint(f"Authentication is enabled", "OK", self._print_enabled, indent=4)
 
-        elif response.status_code == http.HTTPStatus.OK:
+        elif response.status_code == _OK:
             self._test_anon_auth()
 
         else:
-            ptprint(f"Webpage returns status code: {response.status_code}", "OK", not self.args.json, indent=4)
+            ptprint(f"Webpage returns status code: {response.status_code}", "OK", self._print_enabled, indent=4)
 
 
 def run(args, ptjsonlib, helpers, http_client, base_response, kbn=False):
@@ -14,7 +14,6 @@ import http
 import requests
 from requests import Response
 from http import HTTPStatus
-from xml.etree.ElementPath import prepare_parent
 from ptlibs import ptjsonlib
 from ptlibs.ptprinthelper import ptprint
 from packaging.version import Version
@@ -22,6 +21,8 @@ from pathlib import Path
 
 __TESTLABEL__ = "Elasticsearch CVE-2014-3120 test"
 
+_OK, _CREATED = HTTPStatus.OK.value, HTTPStatus.CREATED.value
+
 
 class Vuln:
     """
@@ -31,6 +32,7 @@ class Vuln:
 
     def __init__(self, args: object, ptjsonlib: object, helpers: object, http_client: object, base_response: object, kbn: bool) -> None:
         self.args = args
+        self._print_enabled = not args.json
         self.ptjsonlib = ptjsonlib
         self.helpers = helpers
         self.http_client = http_client
@@ -46,21 +48,21 @@ class Vuln:
         CVE-2014-3120
         """
 
-        version = Version(self.base_response.json().get("version", {}).get("number", {}))
+        version = Version(self.helpers.get_json(self.base_response).get("version", {}).get("number", {}))
 
         if not version:
-            ptprint(f"Could not retrieve Elasticsearch version.", "OK", not self.args.json,
+            ptprint(f"Could not retrieve Elasticsearch version.", "OK", self._print_enabled,
                     indent=4)
             ptprint(f"Received response: {self.base_response.text}", "ADDITIONS", self.args.verbose,
                     indent=4, colortext=True)
             return
 
         if version < Version("1.2"):
-            ptprint(f"Elasticsearch {version} should be vulnerable to {self.cve_id}", "INFO", not self.args.json,
+            ptprint(f"Elasticsearch {version} should be vulnerable to {self.cve_id}", "INFO", self._print_enabled,
                     indent=4)
             return
 
-        ptprint(f"Elasticsearch {version} might not be vulnerable to {self.cve_id}", "INFO", not self.args.json, indent=4)
+        ptprint(f"Elasticsearch {version} might not be vulnerable to {self.cve_id}", "INFO", self._print_enabled, indent=4)
 
 
     def _exploit(self) -> bool:
@@ -83,11 +85,11 @@ class Vuln:
         response = self.http_client.send_request(url=request.url, method=request.method, data=new_document, headers=headers)
 
         try:
-            json_status = response.json().get("status", 201)
+            json_status = self.helpers.get_json(response).get("status", 201)
         except ValueError:
             json_status = 201
 
-        if response.status_code != HTTPStatus.CREATED or json_status != HTTPStatus.CREATED:
+        if response.status_code != _CREATED or json_status != _CREATED:
             ptprint(f"Error when creating new document. Received response code: {response.status_code}", "ADDITIONS",
                     self.args.verbose, indent=4, colortext=True)
             return False
@@ -99,18 +101,18 @@ class Vuln:
                                                  headers=headers)
 
         try:
-            json_status = response.json().get("status", 200)
+            json_status = self.helpers.get_json(response).get("status", 200)
         except ValueError:
             json_status = 200
 
-        if response.status_code != HTTPStatus.OK or json_status != HTTPStatus.OK:
+        if response.status_code != _OK or json_status != _OK:
             ptprint(f"Error when sending request to _search. Received response code: {response.status_code}", "ADDITIONS", self.args.verbose, indent=4, colortext=True)
             return False
 
         if not self.helpers.check_json(response):
             return False
 
-        response = response.json()
+        response = self.helpers.get_json(response)
 
         return response.get('hits', {}).get('hits', [{}])[0].get('fields', {}).get('results', []) == ['exploited\n']
 
@@ -125,7 +127,7 @@ class Vuln:
         self._check_version()
 
         if self._exploit():
-            ptprint(f"The host is vulnerable to {self.cve_id}", "VULN", not self.args.json, indent=4)
+            ptprint(f"The host is vulnerable to {self.cve_id}", "VULN", self._print_enabled, indent=4)
             es_node_key = self.helpers.check_node("swES")
             if es_node_key:
                 self.ptjsonlib.add_vulnerability(f"PTV-{self.cve_id}", node_key=es_node_key)
@@ -133,7 +135,7 @@ class Vuln:
                 self.ptjsonlib.add_vulnerability(f"PTV-{self.cve_id}")
 
         else:
-            ptprint(f"The host is not vulnerable to {self.cve_id}", "OK", not self.args.json, indent=4)
+            ptprint(f"The host is not vulnerable to {self.cve_id}", "OK", self._print_enabled, indent=4)
 
 
 def run(args, ptjsonlib, helpers, http_client, base_response, kbn=False):
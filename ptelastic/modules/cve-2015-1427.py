@@ -21,6 +21,8 @@ import json
 
 __TESTLABEL__ = "Elasticsearch CVE-2015-1427 test"
 
+_OK, _CREATED = HTTPStatus.OK.value, HTTPStatus.CREATED.value
+
 
 class Vuln:
     """
@@ -30,6 +32,7 @@ class Vuln:
 
     def __init__(self, args: object, ptjsonlib: object, helpers: object, http_client: object, base_response: object, kbn: bool) -> None:
         self.args = args
+        self._print_enabled = not args.json
         self.ptjsonlib = ptjsonlib
         self.helpers = helpers
         self.http_client = http_client
@@ -44,20 +47,20 @@ class Vuln:
         This method compares the version of Elasticsearch running on the host to check if it is < 1.3.8 or 1.4.x < 1.4.3
         and thus vulnerable to CVE-2015-1427
         """
-        version = Version(self.base_response.json().get("version", {}).get("number", {}))
+        version = Version(self.helpers.get_json(self.base_response).get("version", {}).get("number", {}))
 
         if not version:
-            ptprint(f"Could not retrieve Elasticsearch version.", "OK", not self.args.json,
+            ptprint(f"Could not retrieve Elasticsearch version.", "OK", self._print_enabled,
                     indent=4)
             ptprint(f"Received response: {self.base_response.text}", "ADDITIONS", self.args.verbose,
                     indent=4, colortext=True)
             return
 
         if version < Version("1.3.8") or (Version("1.4.0") <= version < Version("1.4.3")):
-            ptprint(f"Elasticsearch {version} should be vulnerable to {self.cve_id}", "INFO", not self.args.json, indent=4)
+            ptprint(f"Elasticsearch {version} should be vulnerable to {self.cve_id}", "INFO", self._print_enabled, indent=4)
             return
 
-        ptprint(f"Elasticsearch {version} might not be vulnerable to {self.cve_id}", "INFO", not self.args.json, indent=4)
+        ptprint(f"Elasticsearch {version} might not be vulnerable to {self.cve_id}", "INFO", self._print_enabled, indent=4)
 
 
     def _exploit(self) -> bool:
@@ -83,11 +86,11 @@ class Vuln:
         response = self.http_client.send_request(method=request.method, url=request.url, data=new_document, headers=headers)
 
         try:
-            json_status = response.json().get("status", 201)
+            json_status = self.helpers.get_json(response).get("status", 201)
         except ValueError:
             json_status = 201
 
-        if response.status_code != HTTPStatus.CREATED or json_status != HTTPStatus.CREATED:
+        if response.status_code != _CREATED or json_status != _CREATED:
             ptprint(f"Error when creating new document. Received response code: {response.status_code}", "ADDITIONS",
                     self.args.verbose, indent=4, colortext=True)
             return False
@@ -101,19 +104,19 @@ class Vuln:
         response = self.http_client.send_request(url=request.url, method=request.method, headers=headers, data=payload)
 
         try:
-            json_status = response.json().get("status", 200)
+            json_status = self.helpers.get_json(response).get("status", 200)
         except ValueError:
             json_status = 200
 
-        if response.status_code != HTTPStatus.OK or json_status != HTTPStatus.OK:
-            ptprint(f"Error when sending request to _search?pretty. Received response code: {response.status_code}. Response:\n {json.dumps(response.json(), indent=4)}", "ADDITIONS",
+        if response.status_code != _OK or json_status != _OK:
+            ptprint(f"Error when sending request to _search?pretty. Received response code: {response.status_code}. Response:\n {json.dumps(self.helpers.get_json(response), indent=4)}", "ADDITIONS",
                     self.args.verbose, indent=4, colortext=True)
             return False
 
         if not self.helpers.check_json(response):
             return False
 
-        return response.json().get("hits", {}).get("hits", {})[0].get("fields", {}).get("exploit", {}) == ["exploited\n"]
+        return self.helpers.get_json(response).get("hits", {}).get("hits", {})[0].get("fields", {}).get("exploit", {}) == ["exploited\n"]
 
 
     def run(self) -> None:
@@ -129,7 +132,7 @@ class Vuln:
         self._check_version()
 
         if self._exploit():
-            ptprint(f"The host is vulnerable to {self.cve_id}", "VULN", not self.args.json, indent=4)
+            ptprint(f"The host is vulnerable to {self.cve_id}", "VULN", self._print_enabled, indent=4)
             es_node_key = self.helpers.check_node("swES")
             if es_node_key:
                 self.ptjsonlib.add_vulnerability(f"PTV-{self.cve_id}", node_key=es_node_key)
@@ -137,7 +140,7 @@ class Vuln:
                 self.ptjsonlib.add_vulnerability(f"PTV-{self.cve_id}")
 
         else:
-            ptprint(f"The host is not vulnerable to {self.cve_id}", "OK", not self.args.json, indent=4)
+            ptprint(f"The host is not vulnerable to {self.cve_id}", "OK", self._print_enabled, indent=4)
 
 
 def run(args, ptjsonlib, helpers, http_client, base_response, kbn=False):
@@ -21,6 +21,8 @@ import json
 
 __TESTLABEL__ = "Elasticsearch CVE-2015-3337 test"
 
+_OK = HTTPStatus.OK.value
+
 
 class Vuln:
     """
@@ -29,6 +31,7 @@ class Vuln:
     """
     def __init__(self, args: object, ptjsonlib: object, helpers: object, http_client: object, base_response: object, kbn: bool) -> None:
         self.args = args
+        self._print_enabled = not args.json
         self.ptjsonlib = ptjsonlib
         self.helpers = helpers
         self.http_client = http_client
@@ -42,20 +45,20 @@ class Vuln:
         """
         This method compares the version of Elasticsearch running on the host to check if it is < 1.4.5 or 1.5.x < 1.5.2 and thus vulnerable to CVE-2015-3337
         """
-        version = Version(self.base_response.json().get("version", {}).get("number", {}))
+        version = Version(self.helpers.get_json(self.base_response).get("version", {}).get("number", {}))
 
         if not version:
-            ptprint(f"Could not retrieve Elasticsearch version.", "OK", not self.args.json,
+            ptprint(f"Could not retrieve Elasticsearch version.", "OK", self._print_enabled,
                     indent=4)
             ptprint(f"Received response: {self.base_response.text}", "ADDITIONS", self.args.verbose,
                     indent=4, colortext=True)
             return
 
         if version < Version("1.4.5") or Version("1.5.0") <= version < Version("1.5.2"):
-            ptprint(f"Elasticsearch {version} should be vulnerable to {self.cve_id}", "INFO", not self.args.json, indent=4)
+            ptprint(f"Elasticsearch {version} should be vulnerable to {self.cve_id}", "INFO", self._print_enabled, indent=4)
             return
 
-        ptprint(f"Elasticsearch {version} might not be vulnerable to {self.cve_id}", "INFO", not self.args.json, indent=4)
+        ptprint(f"Elasticsearch {version} might not be vulnerable to {self.cve_id}", "INFO", self._print_enabled, indent=4)
 
 
     def _get_plugins(self) -> list:
@@ -63,21 +66,20 @@ class Vuln:
         This method retrieves all plugins from the /_cat/plugins endpoint and returns a list of all plugin endpoints
         """
         request = self.helpers.KbnUrlParser(self.args.url, "_cat/plugins", "GET", self.kbn)
-        plugins = self.http_client.send_request(method=request.method, url=request.url)
+        plugins = self.helpers.send_request(request, allow_redirects=True)
 
         try:
-            json_status = plugins.json().get("status", 200)
+            json_status = self.helpers.get_json(plugins).get("status", 200)
         except ValueError:
             json_status = 200
 
-        if plugins.status_code != HTTPStatus.OK or json_status != HTTPStatus.OK:
+        if plugins.status_code != _OK or json_status != _OK:
             ptprint(f"Could not get plugins. Received response: {plugins.status_code} {plugins.text}", "ADDITIONS",
                     self.args.verbose, indent=4, colortext=True)
             return []
 
         try:
-            plugins = [plugin[plugin.find("/"):][1:-1] for plugin in plugins.text.split("\n")]
-            plugins = list(filter(None, plugins))   # Remove empty string from plugin list
+            plugins = [line[line.find("/"):][1:-1] for line in plugins.text.splitlines() if "/" in line]
         except Exception as e:
             ptprint(f"Could not get plugins. {e}", "ADDITIONS", self.args.verbose, indent=4, colortext=True)
             return []
@@ -114,13 +116,13 @@ class Vuln:
             response = self.http_client.send_raw_request(url=request.url, method=request.method) # Raw request to avoid path normalization
 
             if self.helpers.check_json(response):
-                ptprint(f"Attempting to exploit plugin {plugin}. Response:\n {json.dumps(response.json(), indent=4)}",
+                ptprint(f"Attempting to exploit plugin {plugin}. Response:\n {json.dumps(self.helpers.get_json(response), indent=4)}",
                         "ADDITIONS", self.args.verbose, indent=4, colortext=True)
             else:
                 ptprint(f"Attempting to exploit plugin {plugin}. Response:\n {response.text}",
                         "ADDITIONS", self.args.verbose, indent=4, colortext=True)
 
-            if response.status == HTTPStatus.OK:
+            if response.status == _OK:
                 exploited = True
                 file_content = response.text
                 break
@@ -130,7 +132,7 @@ class Vuln:
             return exploited
 
 
-        ptprint(f"Contents of {file}: {file_content}", "INFO", not self.args.json, indent=4)
+        ptprint(f"Contents of {file}: {file_content}", "INFO", self._print_enabled, indent=4)
         content_node = self.ptjsonlib.create_node_object("file", properties={"name": file, "fileContent": file_content})
         self.ptjsonlib.add_node(content_node)
 
@@ -148,7 +150,7 @@ class Vuln:
         self._check_version()
 
         if self._exploit():
-            ptprint(f"The host is vulnerable to {self.cve_id}", "VULN", not self.args.json, indent=4)
+            ptprint(f"The host is vulnerable to {self.cve_id}", "VULN", self._print_enabled, indent=4)
             es_node_key = self.helpers.check_node("swES")
             if es_node_key:
                 self.ptjsonlib.add_vulnerability(f"PTV-{self.cve_id}", node_key=es_node_key)
@@ -156,7 +158,7 @@ class Vuln:
                 self.ptjsonlib.add_vulnerability(f"PTV-{self.cve_id}")
 
         else:
-            ptprint(f"The host is not vulnerable to {self.cve_id}", "OK", not self.args.json, indent=4)
+            ptprint(f"The host is not vulnerable to {self.cve_id}", "OK", self._print_enabled, indent=4)
 
 
 def run(args, ptjsonlib, helpers, http_client, base_response, kbn=False):
@@ -23,6 +23,8 @@ import json
 
 __TESTLABEL__ = "Elasticsearch CVE-2015-5531 test"
 
+_OK, _BAD_REQUEST = HTTPStatus.OK.value, HTTPStatus.BAD_REQUEST.value
+
 
 class Vuln:
     """
@@ -31,6 +33,7 @@ class Vuln:
     """
     def __init__(self, args: object, ptjsonlib: object, helpers: object, http_client: object, base_response: object, kbn: bool) -> None:
         self.args = args
+        self._print_enabled = not args.json
         self.ptjsonlib = ptjsonlib
         self.helpers = helpers
         self.http_client = http_client
@@ -44,20 +47,20 @@ class Vuln:
         """
         This method compares the version of Elasticsearch running on the host to check if it is < 1.6.1 and thus vulnerable to CVE-2015-5531
         """
-        version = Version(self.base_response.json().get("version", {}).get("number", {}))
+        version = Version(self.helpers.get_json(self.base_response).get("version", {}).get("number", {}))
 
         if not version:
-            ptprint(f"Could not retrieve Elasticsearch version.", "OK", not self.args.json,
+            ptprint(f"Could not retrieve Elasticsearch version.", "OK", self._print_enabled,
                     indent=4)
             ptprint(f"Received response: {self.base_response.text}", "ADDITIONS", self.args.verbose,
                     indent=4, colortext=True)
             return
 
         if version < Version("1.6.1"):
-            ptprint(f"Elasticsearch {version} should be vulnerable to {self.cve_id}", "INFO", not self.args.json, indent=4)
+            ptprint(f"Elasticsearch {version} should be vulnerable to {self.cve_id}", "INFO", self._print_enabled, indent=4)
             return
 
-        ptprint(f"Elasticsearch {version} might not be vulnerable to {self.cve_id}", "INFO", not self.args.json, indent=4)
+        ptprint(f"Elasticsearch {version} might not be vulnerable to {self.cve_id}", "INFO", self._print_enabled, indent=4)
 
 
     def _create_repo(self) -> bool:
@@ -82,11 +85,11 @@ class Vuln:
         response = self.http_client.send_request(method=request.method, url=request.url, headers=headers, data=new_repository)
 
         try:
-            json_status = response.json().get("status", 200)
+            json_status = self.helpers.get_json(response).get("status", 200)
         except ValueError:
             json_status = 200
 
-        if response.status_code != HTTPStatus.OK or json_status != HTTPStatus.OK:
+        if response.status_code != _OK or json_status != _OK:
             ptprint(f"Could not create backup repository: Received response: {response.status_code} {response.text}", "ADDITIONS",
                     self.args.verbose, indent=4, colortext=True)
             return False
@@ -116,11 +119,11 @@ class Vuln:
                                                  data=new_snapshot)
 
         try:
-            json_status = response.json().get("status", 200)
+            json_status = self.helpers.get_json(response).get("status", 200)
         except ValueError:
             json_status = 200
 
-        if response.status_code != HTTPStatus.OK or json_status != HTTPStatus.OK:
+        if response.status_code != _OK or json_status != _OK:
             ptprint(f"Could not create snapshot: Received response: {response.status_code} {response.text}",
                     "ADDITIONS",
                     self.args.verbose, indent=4, colortext=True)
@@ -142,27 +145,27 @@ class Vuln:
                                                  follow_redirects=False)
 
         try:
-            json_status = response.json().get("status", 400)
+            json_status = self.helpers.get_json(response).get("status", 400)
         except ValueError:
             json_status = 400
 
-        if response.status_code != HTTPStatus.BAD_REQUEST or json_status != HTTPStatus.BAD_REQUEST:
-            ptprint(f"Could not read {file}. Received response: {response.status_code} {json.dumps(response.json(), indent=4)}", "ADDITIONS",
+        if response.status_code != _BAD_REQUEST or json_status != _BAD_REQUEST:
+            ptprint(f"Could not read {file}. Received response: {response.status_code} {json.dumps(self.helpers.get_json(response), indent=4)}", "ADDITIONS",
                     self.args.verbose, indent=4, colortext=True)
             return False
 
-        ascii_list = re.search(r"\[(\d+(?:,\s*\d+)*)\]", response.json().get("error", ""))
+        ascii_list = re.search(r"\[(\d+(?:,\s*\d+)*)\]", self.helpers.get_json(response).get("error", ""))
 
         if not ascii_list:
-            ptprint(f"Could not isolate file from response. Full response:\n {json.dumps(response.json(), indent=4)}", "INFO",
-                    not self.args.json, indent=4)
+            ptprint(f"Could not isolate file from response. Full response:\n {json.dumps(self.helpers.get_json(response), indent=4)}", "INFO",
+                    self._print_enabled, indent=4)
             content_node = self.ptjsonlib.create_node_object("file", properties={"name": file, "fileContent": response.text})
 
         else:
             ascii_list = ascii_list.group(0)[1:-1].split(', ')
             file_content = ''.join([chr(int(letter)) for letter in ascii_list])
             ptprint(f"Contents of {file}: {file_content}", "INFO",
-                    not self.args.json, indent=4)
+                    self._print_enabled, indent=4)
             content_node = self.ptjsonlib.create_node_object("file", properties={"name": file, "fileContent": file_content})
 
         self.ptjsonlib.add_node(content_node)
@@ -196,7 +199,7 @@ class Vuln:
         self._check_version()
 
         if self._exploit():
-            ptprint(f"The host is vulnerable to {self.cve_id}", "VULN", not self.args.json, indent=4)
+            ptprint(f"The host is vulnerable to {self.cve_id}", "VULN", self._print_enabled, indent=4)
             es_node_key = self.helpers.check_node("swES")
             if es_node_key:
                 self.ptjsonlib.add_vulnerability(f"PTV-{self.cve_id}", node_key=es_node_key)
@@ -204,7 +207,7 @@ class Vuln:
                 self.ptjsonlib.add_vulnerability(f"PTV-{self.cve_id}")
 
         else:
-            ptprint(f"The host is not vulnerable to {self.cve_id}", "OK", not self.args.json, indent=4)
+            ptprint(f"The host is not vulnerable to {self.cve_id}", "OK", self._print_enabled, indent=4)
 
 
 def run(args, ptjsonlib, helpers, http_client, base_response, kbn=False):
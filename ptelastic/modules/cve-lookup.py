@@ -18,6 +18,8 @@ from ptlibs.ptprinthelper import ptprint
 
 __TESTLABEL__ = "Elasticsearch CVE lookup"
 
+_OK = HTTPStatus.OK.value
+
 
 class Vuln:
     """
@@ -25,6 +27,7 @@ class Vuln:
     """
     def __init__(self, args: object, ptjsonlib: object, helpers: object, http_client: object, base_response: object, kbn: bool) -> None:
         self.args = args
+        self._print_enabled = not args.json
         self.ptjsonlib = ptjsonlib
         self.helpers = helpers
         self.http_client = http_client
@@ -59,7 +62,7 @@ class Vuln:
             msg = f"The host may be vulnerable to {cve_id}"
             link = f"https://nvd.nist.gov/vuln/detail/{cve_id}"
             cvss = f"CVSS Score: {cvss_score}"
-            ptprint(f"{msg:<50}{link:<52}{cvss}", "VULN", not self.args.json, indent=8)
+            ptprint(f"{msg:<50}{link:<52}{cvss}", "VULN", self._print_enabled, indent=8)
 
             es_node_key = self.helpers.check_node("swES")
             if es_node_key:
@@ -80,10 +83,10 @@ class Vuln:
         if not self.helpers.check_json(self.base_response):
             return
 
-        es_version = self.base_response.json().get("version", {}).get("number", {})
+        es_version = self.helpers.get_json(self.base_response).get("version", {}).get("number", {})
 
         if not es_version:
-            ptprint(f"Could not retrieve Elasticsearch version.", "OK", not self.args.json,
+            ptprint(f"Could not retrieve Elasticsearch version.", "OK", self._print_enabled,
                     indent=4)
             ptprint(f"Received response: {self.base_response.text}", "ADDITIONS", self.args.verbose,
                     indent=4, colortext=True)
@@ -97,7 +100,7 @@ class Vuln:
             self.ptjsonlib.end_error(f"Error retrieving response from NVD database:", details=e,
                                      condition=self.args.json)
 
-        if response.status_code != HTTPStatus.OK:
+        if response.status_code != _OK:
             ptprint(f"Error retrieving response from NVD database. Received response: {response.status_code} {response.text}",
                     "ADDITIONS", self.args.verbose, indent=4, colortext=True)
             return
@@ -105,17 +108,17 @@ class Vuln:
         if not self.helpers.check_json(response):
             return
 
-        response = response.json()
+        response = self.helpers.get_json(response)
         cve_list = response.get("vulnerabilities", [])
 
         if cve_list:
             ptprint(f"Identified {response['totalResults']} possible vulnerabilities in Elasticsearch {es_version}", "VULN",
-                    not self.args.json, indent=4)
+                    self._print_enabled, indent=4)
             self._print_cve(cve_list)
         else:
             ptprint(f"Could not identify any publicly known vulnerabilities in Elasticsearch {es_version}",
                     "OK",
-                    not self.args.json, indent=4)
+                    self._print_enabled, indent=4)
 
 def run(args, ptjsonlib, helpers, http_client, base_response, kbn=False):
     """Entry point for running the Vuln test"""
@@ -10,17 +10,19 @@ import http
 from http.client import responses
 from mimetypes import inited
 import json
+import textwrap
 from typing import Literal
 
 from requests import Response
 from http import HTTPStatus
-from xml.etree.ElementPath import prepare_parent
 
 from ptlibs import ptjsonlib
 from ptlibs.ptprinthelper import ptprint
 
 __TESTLABEL__ = "Elasticsearch data dump module"
 
+_OK = HTTPStatus.OK.value
+
 
 class DataDump:
     """
@@ -28,11 +30,13 @@ class DataDump:
     """
     def __init__(self, args: object, ptjsonlib: object, helpers: object, http_client: object, base_response: object, kbn: bool) -> None:
         self.args = args
+        self._print_enabled = not args.json
         self.ptjsonlib = ptjsonlib
         self.helpers = helpers
         self.http_client = http_client
         self.base_response = base_response
         self.kbn = kbn
+        self.output_file = None
 
         self.helpers.print_header(__TESTLABEL__)
 
@@ -72,8 +76,32 @@ class DataDump:
 
 
     def _write_to_file(self, data) -> None:
-        with open(self.args.output, "w", encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=4)
+        """
+        This method appends one dumped entry to the JSON array in the file provided with the -o/--output argument.
+
+        Entries are written as soon as they are dumped, so the data of all indices is never held in memory at once.
+        The file is created with the first entry, so no file is created if nothing was dumped
+        """
+        if not self.args.output:
+            return
+
+        if self.output_file is None:
+            self.output_file = open(self.args.output, "w", encoding='utf-8')
+            self.output_file.write("[\n")
+        else:
+            self.output_file.write(",\n")
+
+        self.output_file.write(textwrap.indent(json.dumps(data, ensure_ascii=False, indent=4), " " * 4))
+
+
+    def _close_file(self) -> None:
+        """
+        This method closes the JSON array in the output file, if any entry was written
+        """
+        if self.output_file is not None:
+            self.output_file.write("\n]")
+            self.output_file.close()
+            self.output_file = None
 
 
     def run(self) -> None:
@@ -82,9 +110,19 @@ class DataDump:
 
         This method sends an HTTP GET request to all the indices provided with the -di/--dump-index argument (all indices if none are provided)
         and dumps all data from it. If --df/--dump-fields are set, it extracts the desired fields from the data with the _get_field() method
+
+        Search responses are not shared with other modules and the dumped data is written to the output file index by index
         """
-        full_data = []
+        try:
+            self._dump_indices()
+        finally:
+            self._close_file()
 
+
+    def _dump_indices(self) -> None:
+        """
+        This method dumps the data of every index to the terminal and to the output file
+        """
         indices = self.args.dump_index or self.helpers.get_indices(self.http_client, self.args.url, self.kbn, self.args.headers)
 
         for index in indices:
@@ -92,37 +130,35 @@ class DataDump:
                 continue
 
             request = self.helpers.KbnUrlParser(self.args.url, f"{index}/_search?size=10000", "GET", self.kbn)
-            response = self.http_client.send_request(url=request.url, method=request.method, headers=self.args.headers)
+            response = self.helpers.send_request(request, allow_redirects=True, share_response=False)
 
             try:
-                json_status = response.json().get("status", 200)
+                json_status = self.helpers.get_json(response).get("status", 200)
             except ValueError:
                 json_status = 200
 
-            if response.status_code != HTTPStatus.OK or json_status != HTTPStatus.OK or not self.helpers.check_json(response):
+            if response.status_code != _OK or json_status != _OK or not self.helpers.check_json(response):
                 ptprint(f"Error when reading indices: Received response: {response.status_code} {response.text}",
-                        "ADDITIONS", not self.args.json, indent=4, colortext=True)
+                        "ADDITIONS", self._print_enabled, indent=4, colortext=True)
                 continue
 
-            data = response.json().get("hits", {}).get("hits", {})  # limit 10 000 hits
+            data = self.helpers.get_json(response).get("hits", {}).get("hits", {})  # limit 10 000 hits
 
             if not data:
-                ptprint(f"No data was returned for index {index}", "INFO", not self.args.json, indent=4)
+                ptprint(f"No data was returned for index {index}", "INFO", self._print_enabled, indent=4)
                 continue
 
             if self.args.dump_field:
 
                 for entry in data:
                     isolated_data = self._get_field(entry)
-                    ptprint(json.dumps(isolated_data, indent=4), "ADDITIONS", not self.args.json, indent=4) if isolated_data else None
-                    full_data.append(isolated_data) if isolated_data else None
+                    if isolated_data:
+                        ptprint(json.dumps(isolated_data, indent=4), "ADDITIONS", self._print_enabled, indent=4)
+                        self._write_to_file(isolated_data)
 
             else:
-                ptprint(json.dumps(data, indent=4), "ADDITIONS", not self.args.json, indent=4)
-                full_data.append(data) if data else None
-
-        if self.args.output and full_data:
-            self._write_to_file(full_data)
+                ptprint(json.dumps(data, indent=4), "ADDITIONS", self._print_enabled, indent=4)
+                self._write_to_file(data)
 
 
 def run(args, ptjsonlib, helpers, http_client, base_response, kbn=False):
@@ -7,11 +7,14 @@ This module tests if an Elasticsearch instance is running on HTTPS or HTTP
 import http
 from http import HTTPStatus
 from http.client import responses
+from urllib.parse import urlsplit
 from ptlibs import ptjsonlib
 from ptlibs.ptprinthelper import ptprint
 
 __TESTLABEL__ = "Elasticsearch HTTP/S test"
 
+_OK, _UNAUTHORIZED = HTTPStatus.OK.value, HTTPStatus.UNAUTHORIZED.value
+
 
 class HttpTest:
     """
@@ -20,6 +23,7 @@ class HttpTest:
 
     def __init__(self, args: object, ptjsonlib: object, helpers: object, http_client: object, base_response: object, kbn: bool) -> None:
         self.args = args
+        self._print_enabled = not args.json
         self.ptjsonlib = ptjsonlib
         self.helpers = helpers
         self.http_client = http_client
@@ -45,13 +49,13 @@ class HttpTest:
             response = self.base_response
         else:
             request = self.helpers.KbnUrlParser(url, "", "GET", self.kbn)
-            response = self.http_client.send_request(request.url, method=request.method, headers=self.args.headers, allow_redirects=False)
+            response = self.helpers.send_request(request)
 
-        if response.status_code in [HTTPStatus.OK, HTTPStatus.UNAUTHORIZED]:
-            ptprint(f"The host is running on HTTP", "VULN", not self.args.json, indent=4)
+        if response.status_code in [_OK, _UNAUTHORIZED]:
+            ptprint(f"The host is running on HTTP", "VULN", self._print_enabled, indent=4)
             self.ptjsonlib.add_vulnerability("PTV-ELASTIC-MISC-HTTP")
         else:
-            ptprint(f"The host is not running on HTTP", "OK", not self.args.json, indent=4)
+            ptprint(f"The host is not running on HTTP", "OK", self._print_enabled, indent=4)
 
 
     def run(self) -> None:
@@ -63,11 +67,11 @@ class HttpTest:
         If we're provided with an HTTPS URL, we just print a message that says the host is running on HTTPS
         """
 
-        if "http://" in self.args.url:
+        if urlsplit(self.args.url).scheme == "http":
             self._check_http(self.args.url)
             return
 
-        ptprint(f"The host is not running on HTTP", "OK", not self.args.json, indent=4)
+        ptprint(f"The host is not running on HTTP", "OK", self._print_enabled, indent=4)
 
 
 def run(args, ptjsonlib, helpers, http_client, base_response, kbn=False):
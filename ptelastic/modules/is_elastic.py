@@ -10,12 +10,13 @@ Contains:
 
 from requests import Response
 from http import HTTPStatus
-from xml.etree.ElementPath import prepare_parent
 from ptlibs import ptjsonlib
 from ptlibs.ptprinthelper import ptprint
 
 __TESTLABEL__ = "Elasticsearch availability test"
 
+_OK, _UNAUTHORIZED = HTTPStatus.OK.value, HTTPStatus.UNAUTHORIZED.value
+
 
 class IsElastic:
     """
@@ -32,6 +33,7 @@ class IsElastic:
 
     def __init__(self, args: object, ptjsonlib: object, helpers: object, http_client: object, base_response: object, kbn: bool) -> None:
         self.args = args
+        self._print_enabled = not args.json
         self.ptjsonlib = ptjsonlib
         self.helpers = helpers
         self.http_client = http_client
@@ -43,9 +45,22 @@ class IsElastic:
 
     def _contains_es_text(self, response: Response) -> bool:
         """
-        :return: True if the response body contains the word 'elasticsearch'.
+        Only the beginning of the raw body is searched, which is where Elasticsearch puts its identifying fields.
+        This avoids decoding and lowercasing a potentially large body.
+
+        :return: True if the first 4 KiB of the response body contain the word 'elasticsearch'.
         """
-        return "elasticsearch" in response.text.lower()
+        return b"elasticsearch" in response.content[:4096].lower()
+
+
+    def _get_root_cause_type(self, response_json: dict) -> str | None:
+        """
+        :return: Type of the first root cause in an Elasticsearch error response. None if the response has no root cause.
+        """
+        error = response_json.get("error")
+        root_causes = error.get("root_cause") if isinstance(error, dict) else None
+
+        return root_causes[0].get("type") if root_causes else None
 
 
     def run(self) -> None:
@@ -61,34 +76,34 @@ class IsElastic:
         """
 
         response = self.base_response
+        content_type = response.headers.get("content-type", "")
+        elastic_product = response.headers.get("X-elastic-product")
 
         ptprint(f"Full response: {response.text}", "ADDITIONS", self.args.verbose, colortext=True)
 
-        if "application/json" not in response.headers.get("content-type", "") and not self.kbn:
+        if "application/json" not in content_type and not self.kbn:
             self.ptjsonlib.end_error("The host is not running Elasticsearch", self.args.json)
         elif self.kbn:
             raise self.NotElasticsearch
 
-        if response.status_code == HTTPStatus.UNAUTHORIZED:
-            response_json = response.json()
-
-            try:
-                if self._contains_es_text(response):
-                    ptprint(f"The host is running ElasticSearch", "INFO", not self.args.json, colortext=False, indent=4)
-                elif response_json["error"]["root_cause"][0]["type"] == "security_exception":
-                    ptprint(f"The host might be running ElasticSearch", "INFO", not self.args.json, colortext=False, indent=4)
-            except KeyError:
-                ptprint(f"The host is probably not running ElasticSearch", "INFO", not self.args.json, colortext=False, indent=4)
-
-        elif response.status_code == HTTPStatus.OK:
-            try:
-                if response.headers["X-elastic-product"] == "Elasticsearch":
-                    ptprint(f"The host is running ElasticSearch", "INFO", not self.args.json, colortext=False, indent=4)
-            except KeyError:
-                if self._contains_es_text(response):
-                    ptprint(f"The host is running ElasticSearch", "INFO", not self.args.json, colortext=False, indent=4)
-                elif "application/json" in response.headers["Content-Type"]:
-                    ptprint(f"The host might be running ElasticSearch", "INFO", not self.args.json, colortext=False, indent=4)
+        if response.status_code == _UNAUTHORIZED:
+            if elastic_product == "Elasticsearch" or self._contains_es_text(response):
+                ptprint(f"The host is running ElasticSearch", "INFO", self._print_enabled, colortext=False, indent=4)
+            else:
+                root_cause_type = self._get_root_cause_type(self.helpers.get_json(response))
+                if root_cause_type == "security_exception":
+                    ptprint(f"The host might be running ElasticSearch", "INFO", self._print_enabled, colortext=False, indent=4)
+                elif root_cause_type is None:
+                    ptprint(f"The host is probably not running ElasticSearch", "INFO", self._print_enabled, colortext=False, indent=4)
+
+        elif response.status_code == _OK:
+            if elastic_product is not None:
+                if elastic_product == "Elasticsearch":
+                    ptprint(f"The host is running ElasticSearch", "INFO", self._print_enabled, colortext=False, indent=4)
+            elif self._contains_es_text(response):
+                ptprint(f"The host is running ElasticSearch", "INFO", self._print_enabled, colortext=False, indent=4)
+            elif "application/json" in content_type:
+                ptprint(f"The host might be running ElasticSearch", "INFO", self._print_enabled, colortext=False, indent=4)
         elif self.kbn:
             raise self.NotElasticsearch
         else:
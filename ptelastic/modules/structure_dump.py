@@ -12,7 +12,6 @@ from mimetypes import inited
 
 from requests import Response
 from http import HTTPStatus
-from xml.etree.ElementPath import prepare_parent
 
 from ptlibs import ptjsonlib
 from ptlibs.ptprinthelper import ptprint
@@ -20,6 +19,8 @@ import json
 
 __TESTLABEL__ = "Elasticsearch data structure test"
 
+_OK = HTTPStatus.OK.value
+
 
 class StrucDump:
     """
@@ -27,6 +28,7 @@ class StrucDump:
     """
     def __init__(self, args: object, ptjsonlib: object, helpers: object, http_client: object, base_response: object, kbn: bool) -> None:
         self.args = args
+        self._print_enabled = not args.json
         self.ptjsonlib = ptjsonlib
         self.helpers = helpers
         self.http_client = http_client
@@ -60,30 +62,33 @@ class StrucDump:
         Executes the Elasticsearch data structure test
 
         This method gets all indices with the helpers get_indices() method and then prints fields in an index by sending a request to
-        the /<index name> endpoint and then retrieving all the fields with the method _get_fields()
+        the /<index name> endpoint and then retrieving all the fields with the method _get_fields(). The index settings and aliases
+        are dropped from the response with filter_path
 
         If the -vv/--verbose switch is provided, the method prints hidden indices (indices starting with .) along all other indices.
 
         The method adds the retrieved mapping to the JSON output
+
+        The index requests are independent of each other, so they are sent concurrently in batches of -t/--threads requests
+        and processed in order. Their responses are read only here, so they are not shared with other modules
         """
         printed = False
 
-        indices = self.helpers.get_indices(self.http_client, self.args.url, self.kbn, self.args.headers)
-
-        for index in indices:
-            if not self.args.built_in and index.startswith("."):
-                continue
-
-            request = self.helpers.KbnUrlParser(self.args.url, index, "GET", self.kbn)
-            response = self.http_client.send_request(url=request.url, method=request.method, headers=self.args.headers)
+        indices = [index for index in self.helpers.get_indices(self.http_client, self.args.url, self.kbn, self.args.headers)
+                   if self.args.built_in or not index.startswith(".")]
+        index_responses = self.helpers.send_batched_requests(
+            *[self.helpers.KbnUrlParser(self.args.url, f"{index}?filter_path=*.mappings,error,status", "GET", self.kbn) for index in indices],
+            allow_redirects=True, share_response=False
+        )
 
+        for index, response in zip(indices, index_responses):
             try:
-                json_status = response.json().get("status", 200)
+                json_status = self.helpers.get_json(response).get("status", 200)
             except ValueError:
                 json_status = 200
 
-            if response.status_code != HTTPStatus.OK or json_status != HTTPStatus.OK:
-                ptprint(f"Error fetching index {index}. Received response: {response.status_code} {json.dumps(response.json(), indent=4)}",
+            if response.status_code != _OK or json_status != _OK:
+                ptprint(f"Error fetching index {index}. Received response: {response.status_code} {json.dumps(self.helpers.get_json(response), indent=4)}",
                         "ADDITIONS",
                         self.args.verbose, indent=4, colortext=True)
                 continue
@@ -91,7 +96,7 @@ class StrucDump:
             if not self.helpers.check_json(self.base_response):
                 return
 
-            response = response.json()
+            response = self.helpers.get_json(response)
 
             try:
                 fields = self._get_fields(mapping=response[index]["mappings"])
@@ -104,12 +109,12 @@ class StrucDump:
             mapping_node = self.ptjsonlib.create_node_object("indexStructure", properties=index_properties)
             self.ptjsonlib.add_node(mapping_node)
 
-            ptprint(f"Index {index}", "VULN", not self.args.json, indent=4)
-            ptprint(', '.join(fields), "VULN", not self.args.json, indent=8)
+            ptprint(f"Index {index}", "VULN", self._print_enabled, indent=4)
+            ptprint(', '.join(fields), "VULN", self._print_enabled, indent=8)
             printed = True
 
         if not printed:
-            ptprint("Could not find any non built-in indices", "INFO", not self.args.json, indent=4)
+            ptprint("Could not find any non built-in indices", "INFO", self._print_enabled, indent=4)
 
 def run(args, ptjsonlib, helpers, http_client, base_response, kbn=False):
     """Entry point for running the StrucDump test"""
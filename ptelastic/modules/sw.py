@@ -16,6 +16,8 @@ from ptlibs.ptprinthelper import ptprint
 
 __TESTLABEL__ = "Elasticsearch software test"
 
+_OK = HTTPStatus.OK.value
+
 
 class SwTest:
     """
@@ -23,6 +25,7 @@ class SwTest:
     """
     def __init__(self, args: object, ptjsonlib: object, helpers: object, http_client: object, base_response: object, kbn: bool) -> None:
         self.args = args
+        self._print_enabled = not args.json
         self.ptjsonlib = ptjsonlib
         self.helpers = helpers
         self.http_client = http_client
@@ -47,56 +50,68 @@ class SwTest:
 
         response = self.base_response
 
-        if response.status_code != HTTPStatus.OK:
+        if response.status_code != _OK:
             ptprint(f"Could not enumerate ES version. Received response code: {response.status_code}",
-                    "OK", not self.args.json, indent=4)
+                    "OK", self._print_enabled, indent=4)
             return False
 
-        response = response.json()
+        response = self.helpers.get_json(response)
         es_properties = {"esVersion": response.get("version").get("number"),
                          "name": response.get("name"),
                          "clusterName": response.get("cluster_name"),
                          "apacheLuceneVersion": response.get("version").get("lucene_version")
                          }
 
-        ptprint(f"Elasticsearch version: {es_properties['esVersion']}", "VULN", not self.args.json, indent=4)
-        ptprint(f"Cluster name: {es_properties['clusterName']}", "VULN", not self.args.json, indent=4)
-        ptprint(f"Apache Lucene Version: {es_properties['apacheLuceneVersion']}","VULN", not self.args.json, indent=4)
+        ptprint(f"Elasticsearch version: {es_properties['esVersion']}", "VULN", self._print_enabled, indent=4)
+        ptprint(f"Cluster name: {es_properties['clusterName']}", "VULN", self._print_enabled, indent=4)
+        ptprint(f"Apache Lucene Version: {es_properties['apacheLuceneVersion']}","VULN", self._print_enabled, indent=4)
         node = self.ptjsonlib.create_node_object("swES", properties=es_properties)
         self.ptjsonlib.add_node(node)
 
         return True
 
 
-    def _get_modules(self) -> bool:
+    def _get_nodes(self) -> dict | None:
         """
-        This method enumerates the modules running on each Elasticsearch node by sending a GET request to
-        http://<host>/_nodes and going through the JSON response
+        This method sends a single GET request to http://<host>/_nodes and returns the nodes from the JSON response.
 
-        If successful, it adds the module name, version and description into the JSON output
+        The response is limited with filter_path to the node name and the name, version and description of modules and
+        plugins, which are all the module and plugin enumeration needs. Without it, /_nodes returns the full settings,
+        OS, JVM and thread pool information of every node
 
-        :return: False if we get an HTTP response other than 200 OK. True if we get an HTTP 200 OK and we find modules
+        :return: Dictionary of nodes if we get an HTTP 200 OK. None otherwise
         """
-        request = self.helpers.KbnUrlParser(self.args.url, "_nodes", "GET", self.kbn)
-        response = self.http_client.send_request(request.url, method=request.method, headers=self.args.headers, allow_redirects=False)
+        filter_path = ("nodes.*.name,"
+                       "nodes.*.modules.name,nodes.*.modules.version,nodes.*.modules.description,"
+                       "nodes.*.plugins.name,nodes.*.plugins.version")
+        request = self.helpers.KbnUrlParser(self.args.url, f"_nodes?filter_path={filter_path}", "GET", self.kbn)
+        response = self.helpers.send_request(request)
 
         try:
-            json_status = response.json().get("status", 200)
+            json_status = self.helpers.get_json(response).get("status", 200)
         except ValueError:
             json_status = 200
 
-        if response.status_code != HTTPStatus.OK or json_status != HTTPStatus.OK:
-            ptprint(f"Could not enumerate modules", "OK",
-                    not self.args.json, indent=4)
+        if response.status_code != _OK or json_status != _OK:
+            ptprint(f"Could not enumerate modules and plugins", "OK",
+                    self._print_enabled, indent=4)
             ptprint(f"Received response code: {response.status_code}", "ADDITIONS", self.args.verbose, indent=4, colortext=True)
-            return False
+            return None
 
-        response = response.json()
-        nodes = response["nodes"].keys()
+        return self.helpers.get_json(response).get("nodes", {})
+
+
+    def _get_modules(self, nodes: dict) -> bool:
+        """
+        This method enumerates the modules running on each Elasticsearch node by going through the nodes returned
+        by the _get_nodes() method
 
-        for node in nodes:
-            modules = response["nodes"][node]["modules"]
-            for module in modules:
+        If successful, it adds the module name, version and description into the JSON output
+
+        :return: True
+        """
+        for node in nodes.values():
+            for module in node.get("modules", []):
                 module_properties = {
                     "name": module.get("name"),
                     "version": module.get("version"),
@@ -105,49 +120,31 @@ class SwTest:
                 json_node = self.ptjsonlib.create_node_object("swModule", properties=module_properties)
                 self.ptjsonlib.add_node(json_node)
                 ptprint(f"Found module: {module_properties['name']} {module_properties['version']}",
-                        "VULN", not self.args.json, indent=4)
+                        "VULN", self._print_enabled, indent=4)
 
         return True
 
 
-    def _get_plugins(self) -> bool:
+    def _get_plugins(self, nodes: dict) -> bool:
         """
-        This method enumerates the plugins installed on each Elasticsearch node by sending a GET request to
-        http://<host>/_cat/plugins/ and going through the JSON response
+        This method enumerates the plugins installed on each Elasticsearch node by going through the nodes returned
+        by the _get_nodes() method
 
         If successful, it adds the plugin node, name and version into the JSON output
 
-        :return: False if we get an HTTP response other than 200 OK. True if we get an HTTP 200 OK
+        :return: True
         """
-        request = self.helpers.KbnUrlParser(self.args.url, "_cat/plugins", "GET", self.kbn)
-        response = self.http_client.send_request(request.url, method=request.method, headers=self.args.headers, allow_redirects=False)
-
-        try:
-            json_status = response.json().get("status", 200)
-        except ValueError:
-            json_status = 200
-
-        if response.status_code != HTTPStatus.OK or json_status != HTTPStatus.OK:
-            ptprint(f"Could not enumerate plugins.", "OK",
-                    not self.args.json, indent=4)
-            ptprint(f"Received response code: {response.status_code}", "ADDITIONS", self.args.verbose, indent=4,
-                    colortext=True)
-            return False
-
-        plugins = [line.split(" ") for line in response.text.split("\n")]
-        del plugins[-1]    # remove empty string from plugin list
-
-        for plugin in plugins:
-            plugin = list(filter(None, plugin)) # remove empty string from plugin
-            plugin_properties = {
-                "esNode": plugin[0],
-                "name": plugin[1],
-                "version": plugin[2]
-            }
-            json_node = self.ptjsonlib.create_node_object("swPlugin", properties=plugin_properties)
-            self.ptjsonlib.add_node(json_node)
-            ptprint(f"Found plugin: {plugin_properties['name']} {plugin_properties['version']} "
-                    f"on node: {plugin_properties['esNode']}", "VULN", not self.args.json, indent=4)
+        for node in nodes.values():
+            for plugin in node.get("plugins", []):
+                plugin_properties = {
+                    "esNode": node.get("name"),
+                    "name": plugin.get("name"),
+                    "version": plugin.get("version")
+                }
+                json_node = self.ptjsonlib.create_node_object("swPlugin", properties=plugin_properties)
+                self.ptjsonlib.add_node(json_node)
+                ptprint(f"Found plugin: {plugin_properties['name']} {plugin_properties['version']} "
+                        f"on node: {plugin_properties['esNode']}", "VULN", self._print_enabled, indent=4)
 
         return True
 
@@ -158,30 +155,41 @@ class SwTest:
 
         Runs ES version enumeration, module enumeration and plugin enumeration. If any of these 3 are successful (they
         return True) it adds the PTV-WEV-MISC-TECH vulnerability to the JSON output
+
+        Modules and plugins are both read from a single request to the /_nodes endpoint
         """
 
         es_version, modules, plugins = False, False, False
+        nodes = None
 
         try:
             es_version = self._get_es_version()
         except Exception as e:
             ptprint(f"Error when enumerating es version", "ERROR",
-                    not self.args.json, indent=4)
+                    self._print_enabled, indent=4)
             ptprint(f"{e}", "ADDITIONS", self.args.verbose, indent=4, colortext=True)
 
         try:
-            modules = self._get_modules()
+            nodes = self._get_nodes()
         except Exception as e:
-            ptprint(f"Error when enumerating modules", "ERROR",
-                    not self.args.json, indent=4)
+            ptprint(f"Error when enumerating modules and plugins", "ERROR",
+                    self._print_enabled, indent=4)
             ptprint(f"{e}", "ADDITIONS", self.args.verbose, indent=4, colortext=True)
 
-        try:
-            plugins = self._get_plugins()
-        except Exception as e:
-            ptprint(f"Error when enumerating plugins", "ERROR",
-                    not self.args.json, indent=4)
-            ptprint(f"{e}", "ADDITIONS", self.args.verbose, indent=4, colortext=True)
+        if nodes is not None:
+            try:
+                modules = self._get_modules(nodes)
+            except Exception as e:
+                ptprint(f"Error when enumerating modules", "ERROR",
+                        self._print_enabled, indent=4)
+                ptprint(f"{e}", "ADDITIONS", self.args.verbose, indent=4, colortext=True)
+
+            try:
+                plugins = self._get_plugins(nodes)
+            except Exception as e:
+                ptprint(f"Error when enumerating plugins", "ERROR",
+                        self._print_enabled, indent=4)
+                ptprint(f"{e}", "ADDITIONS", self.args.verbose, indent=4, colortext=True)
 
         if plugins or modules or es_version:
             self.ptjsonlib.add_vulnerability("PTV-WEB-MISC-TECH")
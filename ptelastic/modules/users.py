@@ -13,13 +13,14 @@ from json import JSONDecoder
 
 from requests import Response
 from http import HTTPStatus
-from xml.etree.ElementPath import prepare_parent
 
 from ptlibs import ptjsonlib
 from ptlibs.ptprinthelper import ptprint
 
 __TESTLABEL__ = "Elasticsearch user enumeration"
 
+_OK = HTTPStatus.OK.value
+
 
 class Users:
     """
@@ -27,6 +28,7 @@ class Users:
     """
     def __init__(self, args: object, ptjsonlib: object, helpers: object, http_client: object, base_response: object, kbn: bool) -> None:
         self.args = args
+        self._print_enabled = not args.json
         self.ptjsonlib = ptjsonlib
         self.helpers = helpers
         self.http_client = http_client
@@ -40,33 +42,43 @@ class Users:
         """
         This method enumerates all privileges assigned to a specific role by going through the JSON output provided by the /_security/roles endpoint.
 
-        Adds the privileges to the JSON output
+        Adds the privileges to the JSON output. A role that is assigned to the user but missing from the /_security/roles output
+        (e.g. it was never defined) is reported and skipped
         """
-        indices = role_privileges[role]['indices']
-        applications = role_privileges[role]['applications']
+        role_definition = role_privileges.get(role)
+
+        if role_definition is None:
+            ptprint(f"Could not enumerate privileges", "OK", self._print_enabled, indent=12)
+            return
+
+        indices = role_definition['indices']
+        applications = role_definition['applications']
+
+        role_properties = user_properties["roles"][role]
 
         for index in indices:
+            names = index["names"]
             privileges = index["privileges"]
-            if index["names"][0] == '*':
-                index_name = "ALL"
-            else:
-                index_name = ', '.join(index['names'])
+            index_name = "ALL" if names[0] == '*' else ', '.join(names)
+            privileges_name = ', '.join(privileges).upper()
 
-            user_properties["roles"][role].append({index_name: privileges})
+            role_properties.append({index_name: privileges})
 
-            ptprint(f"Privileges on indices: {index_name}: {', '.join(privileges).upper()}; Can edit restricted indices: "
+            ptprint(f"Privileges on indices: {index_name}: {privileges_name}; Can edit restricted indices: "
                     f"{index["allow_restricted_indices"]}",
-                    "VULN", not self.args.json, indent=12)
+                    "VULN", self._print_enabled, indent=12)
 
         for app in applications:
-            privileges = "ALL" if app["privileges"][0] == '*' else app["privileges"]
-            privileges_name = "ALL" if app["privileges"][0] == '*' else ', '.join(app["privileges"]).upper()
+            app_privileges = app["privileges"]
+            all_privileges = app_privileges[0] == '*'
+            privileges = "ALL" if all_privileges else app_privileges
+            privileges_name = "ALL" if all_privileges else ', '.join(app_privileges).upper()
             app_name = "app_ALL" if app["application"] == "*" else "app_" + app["application"]
 
-            user_properties["roles"][role].append({app_name: privileges})
+            role_properties.append({app_name: privileges})
 
             ptprint(f"Privileges on application: {app_name}: {privileges_name}",
-                    "VULN", not self.args.json, indent=12)
+                    "VULN", self._print_enabled, indent=12)
 
     def _print_user(self, user_properties: dict, check_roles: bool, role_privileges: dict) -> None:
         """
@@ -75,20 +87,20 @@ class Users:
         If we're able to list roles from the /_security/role endpoint, we enumerate privileges assigned to the roles of a user
         with the _check_privileges method
         """
-        ptprint(f"Found user: {user_properties['username']}", "VULN", not self.args.json, indent=4)
-        ptprint(f"Email: {user_properties['email']}", "VULN", not self.args.json, indent=8)
+        ptprint(f"Found user: {user_properties['username']}", "VULN", self._print_enabled, indent=4)
+        ptprint(f"Email: {user_properties['email']}", "VULN", self._print_enabled, indent=8)
 
         roles = set(user_properties["roles"])
 
         for role in roles:
             if role == "superuser":
-                ptprint(f"\033[0mRole: \033[31m{role}", "VULN", not self.args.json, indent=8, colortext=True)
+                ptprint(f"\033[0mRole: \033[31m{role}", "VULN", self._print_enabled, indent=8, colortext=True)
             else:
-                ptprint(f"Role: {role}", "VULN", not self.args.json, indent=8)
+                ptprint(f"Role: {role}", "VULN", self._print_enabled, indent=8)
             if check_roles:
                 self._check_privileges(role, role_privileges, user_properties)
             else:
-                ptprint(f"Could not enumerate privileges","OK", not self.args.json, indent=4)
+                ptprint(f"Could not enumerate privileges","OK", self._print_enabled, indent=4)
 
 
 
@@ -100,44 +112,47 @@ class Users:
         User by user adds the username, roles and email to the JSON output
 
         If the host returns an HTTP response other than 200 OK we exit
+
+        The /_security/role endpoint is requested together with /_security/user, so both round trips overlap
         """
         check_roles = False
-        request = self.helpers.KbnUrlParser(self.args.url, "_security/user", "GET", self.kbn)
-        response = self.http_client.send_request(request.url, method=request.method,
-                                                 headers=self.args.headers, allow_redirects=False)
+        response, roles_response = self.helpers.send_concurrent_requests(
+            self.helpers.KbnUrlParser(self.args.url, "_security/user", "GET", self.kbn),
+            self.helpers.KbnUrlParser(self.args.url, "_security/role", "GET", self.kbn)
+        )
 
         try:
-            json_status = response.json().get("status", 200)
+            json_status = self.helpers.get_json(response).get("status", 200)
         except ValueError:
             json_status = 200
 
-        if response.status_code != HTTPStatus.OK or json_status != HTTPStatus.OK:
+        if response.status_code != _OK or json_status != _OK:
             ptprint(f"Could not enumerate users.",
-                    "OK", not self.args.json, indent=4)
+                    "OK", self._print_enabled, indent=4)
             ptprint(f"Received status code: {response.status_code}", "ADDITIONS", self.args.verbose, indent=4, colortext=True)
             return
 
         if not self.helpers.check_json(response):
             return
 
-        users = response.json()
-        request = self.helpers.KbnUrlParser(self.args.url, "_security/role", "GET", self.kbn)
-        response = self.http_client.send_request(request.url, method=request.method,
-                                                 headers=self.args.headers, allow_redirects=False)
+        users = self.helpers.get_json(response)
+        response = roles_response
 
         if not self.helpers.check_json(response):
             return
 
-        if response.status_code == HTTPStatus.OK:
+        if response.status_code == _OK:
             check_roles = True
 
+        role_privileges = self.helpers.get_json(response) if check_roles else {}
+
         for entry in users:
             user = users[entry]
-            roles = dict([(role_name, privileges) for role_name, privileges in zip(user['roles'], [[]])])
+            roles = {role_name: [] for role_name in user['roles']}
             user_properties = {"username": user["username"], "email": user["email"], "roles": roles}
             json_node = self.ptjsonlib.create_node_object("user", properties=user_properties)
             self.ptjsonlib.add_node(json_node)
-            self._print_user(user_properties, check_roles, response.json())
+            self._print_user(user_properties, check_roles, role_privileges)
 
 
 def run(args, ptjsonlib, helpers, http_client, base_response, kbn=False):
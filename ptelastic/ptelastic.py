@@ -27,13 +27,13 @@ sys.path.append(__file__.rsplit("/", 1)[0])
 
 from io import StringIO
 from types import ModuleType
-from urllib.parse import urlparse, urlunparse
+from urllib.parse import urlparse, urlsplit, urlunparse
 
 from ptlibs import ptjsonlib, ptmisclib, ptnethelper
 from ptlibs.ptprinthelper import ptprint, print_banner, help_print
 from ptlibs.threads import ptthreads, printlock
-from ptlibs.http.http_client import HttpClient
 
+from helpers._pooled_http_client import PooledHttpClient
 from helpers._thread_local_stdout import ThreadLocalStdout
 from helpers.helpers import Helpers
 from _version import __version__
@@ -47,7 +47,8 @@ class PtElastic:
         self.ptthreads   = ptthreads.PtThreads()
         self._lock       = threading.Lock()
         self.args        = args
-        self.http_client = HttpClient(args=self.args, ptjsonlib=self.ptjsonlib)
+        self._print_enabled = not args.json
+        self.http_client = PooledHttpClient(args=self.args, ptjsonlib=self.ptjsonlib)
         self.helpers     = Helpers(args=self.args, ptjsonlib=self.ptjsonlib, http_client=self.http_client)
 
         # Activate ThreadLocalStdout stdout proxy
@@ -101,7 +102,7 @@ class PtElastic:
             base_response=self.base_response,
             kbn=False
         ).run()
-        ptprint(" ", "TEXT", not self.args.json)
+        ptprint(" ", "TEXT", self._print_enabled)
 
     def _fetch_initial_response(self) -> None:
         """
@@ -160,21 +161,21 @@ class PtElastic:
                     )
 
                 except Exception as e:
-                    ptprint(e, "ERROR", not self.args.json)
+                    ptprint(e, "ERROR", self._print_enabled)
                     error = e
                 else:
                     error = None
                 finally:
                     self.thread_local_stdout.clear_thread_buffer()
                     with self._lock:
-                        ptprint(buffer.getvalue(), "TEXT", not self.args.json, end="\n")
+                        ptprint(buffer.getvalue(), "TEXT", self._print_enabled, end="\n")
             else:
-                ptprint(f"Module '{module_name}' does not have 'run' function", "WARNING", not self.args.json)
+                ptprint(f"Module '{module_name}' does not have 'run' function", "WARNING", self._print_enabled)
 
         except FileNotFoundError as e:
-            ptprint(f"Module '{module_name}' not found", "ERROR", not self.args.json)
+            ptprint(f"Module '{module_name}' not found", "ERROR", self._print_enabled)
         except Exception as e:
-            ptprint(f"Error running module '{module_name}': {e}", "ERROR", not self.args.json)
+            ptprint(f"Error running module '{module_name}': {e}", "ERROR", self._print_enabled)
 
 def _import_module_from_path(module_name: str) -> ModuleType:
     """
@@ -286,15 +287,16 @@ def parse_args() -> argparse.Namespace:
 
         www.example.com:9200 -> \\http://www.example.com:9200
 
-        Doesn't do anything if a protocol is provided
+        Doesn't do anything if a protocol is provided. The scheme is parsed once with urlsplit, anything other than
+        http or https (e.g. 'localhost' in localhost:9200) is treated as a missing protocol
 
         Also adds trailing '/' if missing
 
         :return: Edited URL
         """
 
-        if "http://" not in url and "https://" not in url:
-            url =  "http://" + url
+        if urlsplit(url).scheme not in ("http", "https"):
+            url = "http://" + url
 
         if not url.endswith("/"):
             url += '/'